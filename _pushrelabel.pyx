@@ -0,0 +1,293 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython build of the push-relabel kernels in push-relabel.py.
+
+Used by push-relabel.py when Numba is not installed. Build it next to the
+script with:
+
+    python setup.py build_ext --inplace
+
+solve() takes the same arguments as the Python kernel and mirrors it
+function by function; keep the two in sync.
+"""
+
+ctypedef long long i64
+
+# Arc capacities are 32-bit when every capacity fits, 64-bit otherwise
+ctypedef fused cap_t:
+    int
+    long long
+
+# Global relabeling runs whenever the push/relabel work since the previous
+# one exceeds GLOBAL_UPDATE_ALPHA * n + GLOBAL_UPDATE_BETA * m
+cdef double GLOBAL_UPDATE_ALPHA = 6
+cdef double GLOBAL_UPDATE_BETA = 0.5
+
+
+cdef inline void height_link(i64 v, i64 h, i64[:] h_head, i64[:] h_next,
+                             i64[:] h_prev) noexcept nogil:
+    """Inserts node v at the front of the list of height h."""
+    cdef i64 first = h_head[h]
+    h_prev[v] = -1
+    h_next[v] = first
+    if first != -1:
+        h_prev[first] = v
+    h_head[h] = v
+
+
+cdef inline void height_unlink(i64 v, i64 h, i64[:] h_head, i64[:] h_next,
+                               i64[:] h_prev) noexcept nogil:
+    """Removes node v from the list of height h."""
+    if h_prev[v] != -1:
+        h_next[h_prev[v]] = h_next[v]
+    else:
+        h_head[h] = h_next[v]
+    if h_next[v] != -1:
+        h_prev[h_next[v]] = h_prev[v]
+
+
+cdef inline void enqueue(i64 v, i64[:] dist, i64[:] bucket_head, i64[:] next_in_bucket,
+                         i64[:] max_height) noexcept nogil:
+    """Adds a node that just gained excess to the bucket of its height."""
+    cdef i64 h = dist[v]
+    next_in_bucket[v] = bucket_head[h]
+    bucket_head[h] = v
+    if h > max_height[0]:
+        max_height[0] = h
+
+
+cdef inline void push(i64 u, i64 i, i64[:] excess, i64[:] dist, i64[:] bucket_head,
+                      i64[:] next_in_bucket, i64[:] max_height,
+                      i64[:] edge_to, i64[:] edge_rev, cap_t[:] residual) noexcept nogil:
+    """Pushes flow from node u to edge_to[i] across the admissible arc i."""
+    # discharge only calls this with excess[u] > 0 and residual[i] > 0, so amt > 0
+    cdef i64 amt = min(excess[u], <i64>residual[i])
+    cdef i64 v = edge_to[i]
+
+    # Forward and reverse arc residual updates
+    residual[i] -= amt
+    residual[edge_rev[i]] += amt
+
+    # Excess update
+    excess[u] -= amt
+    excess[v] += amt
+
+    # Enqueue the receiving node if it just became active
+    if excess[v] == amt:
+        enqueue(v, dist, bucket_head, next_in_bucket, max_height)
+
+
+cdef void gap(i64 k, i64[:] dist, int[:] count, i64[:] h_head, i64[:] h_next, i64[:] h_prev,
+              i64 n) noexcept nogil:
+    """Performs the gap heuristic when count[k] == 1 for some k < n."""
+    cdef i64 h, v, next_v
+    # Every node with a label in [k, n) can no longer reach the sink. Nodes
+    # above the node being discharged are inactive, so no bucket changes.
+    # Occupied labels below n are contiguous, so the walk stops at the first
+    # empty height.
+    for h in range(k, n):
+        v = h_head[h]
+        if v == -1:
+            break
+
+        while v != -1:
+            next_v = h_next[v]
+            # Relabel to n + 1 (effectively infinity)
+            dist[v] = n + 1
+            height_link(v, n + 1, h_head, h_next, h_prev)
+            count[n + 1] += 1
+            v = next_v
+
+        h_head[h] = -1
+        count[h] = 0
+
+
+cdef void relabel(i64 u, i64[:] dist, int[:] count, i64[:] h_head, i64[:] h_next, i64[:] h_prev,
+                  i64[:] row_start, i64[:] row_end, i64[:] edge_to, cap_t[:] residual,
+                  i64 n) noexcept nogil:
+    """Increases the distance label of u."""
+    cdef i64 i
+    cdef i64 new_dist = 2 * n  # Initialize to a large value
+
+    count[dist[u]] -= 1
+    height_unlink(u, dist[u], h_head, h_next, h_prev)
+
+    # Find the minimum possible new distance label
+    for i in range(row_start[u], row_end[u]):
+        if residual[i] > 0:
+            new_dist = min(new_dist, dist[edge_to[i]] + 1)
+
+    dist[u] = new_dist
+    count[dist[u]] += 1
+    height_link(u, new_dist, h_head, h_next, h_prev)
+
+
+cdef i64 discharge(i64 u, i64[:] excess, i64[:] dist, int[:] count, i64[:] head,
+                   i64[:] row_start, i64[:] row_end, i64[:] edge_to, cap_t[:] residual,
+                   i64[:] edge_rev, i64[:] bucket_head, i64[:] next_in_bucket,
+                   i64[:] max_height, i64[:] h_head, i64[:] h_next, i64[:] h_prev,
+                   i64 n) noexcept nogil:
+    """Discharges the excess flow from node u and returns the work done."""
+    cdef i64 work = 0
+    cdef i64 start, end, i, dist_u
+    cdef bint admissible
+    # Work is one unit per push plus the arcs scanned by each relabel.
+    # The row of u never changes, so its bounds are read once. The current
+    # arc and the label of u live in locals for the whole discharge; head[u]
+    # is written back on exit
+    start = row_start[u]
+    end = row_end[u]
+    i = start + head[u]
+    dist_u = dist[u]
+    while excess[u] > 0:
+        if i < end:
+            # Current arc heuristic
+            # Check for residual capacity and valid height for pushing; the
+            # non-short-circuit & leaves one data-dependent branch per arc
+            admissible = (residual[i] > 0) & (dist_u == dist[edge_to[i]] + 1)
+            if admissible:
+                push(u, i, excess, dist, bucket_head, next_in_bucket, max_height,
+                     edge_to, edge_rev, residual)
+                work += 1
+            else:
+                i += 1  # Advance current arc
+        else:
+            # No suitable arc found, need to relabel or apply gap heuristic
+
+            # Check for gap heuristic condition (only one node at this height)
+            if dist_u < n and count[dist_u] == 1:
+                gap(dist_u, dist, count, h_head, h_next, h_prev, n)
+            else:
+                relabel(u, dist, count, h_head, h_next, h_prev,
+                        row_start, row_end, edge_to, residual, n)
+                work += end - start
+
+            # After relabel/gap, pick up the new label and reset current arc
+            dist_u = dist[u]
+            i = start
+
+    head[u] = i - start
+    return work
+
+
+cdef void global_relabel(i64 s, i64 t, i64[:] excess, i64[:] dist, int[:] count, i64[:] head,
+                         i64[:] bucket_head, i64[:] next_in_bucket, i64[:] max_height,
+                         i64[:] h_head, i64[:] h_next, i64[:] h_prev, i64[:] bfs_queue,
+                         i64[:] row_start, i64[:] row_end, i64[:] edge_to, i64[:] edge_rev,
+                         cap_t[:] residual, i64 n) noexcept nogil:
+    """Sets every label to its exact residual distance."""
+    cdef i64 v, h, x, y, i, j, d
+    cdef i64 q_head = 0
+    cdef i64 q_tail = 1
+    # Reverse BFS from the sink, then from the source (offset by n) for the
+    # nodes that can only return their excess. Nodes reached by neither keep
+    # the unreachable label 2n. Exact distances never lower a valid label.
+    # count, the height lists, the current arcs and the active buckets are
+    # rebuilt from the new labels at the end.
+    for v in range(n):
+        dist[v] = 2 * n
+    dist[t] = 0
+    bfs_queue[0] = t
+    while True:
+        while q_head < q_tail:
+            x = bfs_queue[q_head]
+            q_head += 1
+            d = dist[x] + 1
+            for i in range(row_start[x], row_end[x]):
+                y = edge_to[i]
+                j = edge_rev[i]
+                # y can reach x if its arc y -> x has residual capacity
+                if dist[y] == 2 * n and y != s and residual[j] > 0:
+                    dist[y] = d
+                    bfs_queue[q_tail] = y
+                    q_tail += 1
+
+        if dist[s] != 2 * n:
+            break
+        dist[s] = n
+        bfs_queue[q_tail] = s
+        q_tail += 1
+
+    for h in range(2 * n + 1):
+        count[h] = 0
+        bucket_head[h] = -1
+        h_head[h] = -1
+    max_height[0] = -1
+    for v in range(n):
+        count[dist[v]] += 1
+        height_link(v, dist[v], h_head, h_next, h_prev)
+        # Labels changed, so every current arc starts over
+        head[v] = 0
+        if v != s and v != t and excess[v] > 0:
+            enqueue(v, dist, bucket_head, next_in_bucket, max_height)
+
+
+def solve(i64 s, i64 t, i64[:] excess, i64[:] dist, int[:] count, i64[:] head,
+          i64[:] bucket_head, i64[:] next_in_bucket, i64[:] max_height,
+          i64[:] h_head, i64[:] h_next, i64[:] h_prev, i64[:] bfs_queue,
+          i64[:] row_start, i64[:] row_end, i64[:] edge_to, i64[:] edge_rev,
+          cap_t[:] edge_cap, cap_t[:] residual, i64 n):
+    """Runs the whole push-relabel loop from source s to sink t and returns the flow value."""
+    cdef i64 i, v, u, h, amt
+    cdef i64 work = 0
+    cdef i64 flow = 0
+    cdef double update_threshold
+
+    with nogil:
+        # Start from the zero flow, so that repeated solves on one graph reuse
+        # every array in place (global_relabel below rewrites dist, count, head,
+        # the height lists and the buckets)
+        for v in range(n):
+            excess[v] = 0
+        for i in range(residual.shape[0]):
+            residual[i] = edge_cap[i]
+
+        # Initial push from source s
+        for i in range(row_start[s], row_end[s]):
+            amt = residual[i]
+
+            if amt == 0:
+                continue
+
+            v = edge_to[i]
+            residual[i] = 0
+            residual[edge_rev[i]] += amt
+            excess[v] += amt
+
+        # Exact initial labels; this also fills count, the height lists and the active buckets
+        global_relabel(s, t, excess, dist, count, head, bucket_head, next_in_bucket, max_height,
+                       h_head, h_next, h_prev, bfs_queue,
+                       row_start, row_end, edge_to, edge_rev, residual, n)
+
+        # Global update heuristic: relabel globally again once the work since the
+        # last update exceeds ALPHA * n + BETA * m (hi_pr's frequency)
+        update_threshold = GLOBAL_UPDATE_ALPHA * n + GLOBAL_UPDATE_BETA * edge_to.shape[0]
+
+        # Main loop: discharge the active node with the highest label
+        while max_height[0] >= 0:
+            if work > update_threshold:
+                global_relabel(s, t, excess, dist, count, head, bucket_head, next_in_bucket,
+                               max_height, h_head, h_next, h_prev, bfs_queue,
+                               row_start, row_end, edge_to, edge_rev, residual, n)
+                work = 0
+                continue
+
+            h = max_height[0]
+            u = bucket_head[h]
+            if u == -1:
+                max_height[0] = h - 1
+                continue
+            bucket_head[h] = next_in_bucket[u]
+
+            if u == s or u == t:
+                continue
+
+            work += discharge(u, excess, dist, count, head, row_start, row_end,
+                              edge_to, residual, edge_rev,
+                              bucket_head, next_in_bucket, max_height, h_head, h_next, h_prev, n)
+
+        # The flow on an arc is its capacity minus its residual capacity
+        for i in range(row_start[s], row_end[s]):
+            flow += edge_cap[i] - residual[i]
+
+    return flow
@@ -1,165 +1,449 @@
 import sys
 import time
-from collections import deque
-from typing import List, Optional
-
-# Equivalent to the C++ struct Edge
-class Edge:
-    """Represents an edge in the flow network."""
-    def __init__(self, to_node: int, rev_index: int, flow: int, cap: int):
-        self.to: int = to_node  # The node this edge goes to
-        self.rev: int = rev_index  # Index of the reverse edge in adj[to]
-        self.flow: int = flow    # Current flow on the edge
-        self.cap: int = cap      # Capacity of the edge
+from array import array
+from typing import Optional
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    # Numba is optional: without it the kernels below run as plain Python,
+    # unless the Cython build of solve() is importable (see below)
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Global relabeling runs whenever the push/relabel work since the previous
+# one exceeds GLOBAL_UPDATE_ALPHA * n + GLOBAL_UPDATE_BETA * m
+GLOBAL_UPDATE_ALPHA = 6
+GLOBAL_UPDATE_BETA = 0.5
+
+
+# The kernels below operate on the CSR arrays of a PushRelabel instance.
+# Active nodes are kept in one bucket per height: bucket_head[h] is the first
+# active node with dist == h (or -1) and next_in_bucket[v] links the rest.
+# max_height is a one-element array holding the highest possibly non-empty
+# bucket, so that enqueue can raise it in place.
+#
+# A node enters a bucket when its excess becomes positive and leaves it when
+# it is selected for discharge, which runs until its excess is zero. Labels
+# only change for the node being discharged and for inactive nodes, so a
+# bucketed node never needs to move.
+#
+# Separately, every node is on the doubly linked list of its height:
+# h_head[h] is its first node (or -1), h_next/h_prev link the rest.
+
+@njit(cache=True)
+def height_link(v, h, h_head, h_next, h_prev):
+    """Inserts node v at the front of the list of height h."""
+    first = h_head[h]
+    h_prev[v] = -1
+    h_next[v] = first
+    if first != -1:
+        h_prev[first] = v
+    h_head[h] = v
+
+
+@njit(cache=True)
+def height_unlink(v, h, h_head, h_next, h_prev):
+    """Removes node v from the list of height h."""
+    if h_prev[v] != -1:
+        h_next[h_prev[v]] = h_next[v]
+    else:
+        h_head[h] = h_next[v]
+    if h_next[v] != -1:
+        h_prev[h_next[v]] = h_prev[v]
+
+
+@njit(cache=True)
+def enqueue(v, dist, bucket_head, next_in_bucket, max_height):
+    """Adds a node that just gained excess to the bucket of its height."""
+    h = dist[v]
+    next_in_bucket[v] = bucket_head[h]
+    bucket_head[h] = v
+    if h > max_height[0]:
+        max_height[0] = h
+
+
+@njit(cache=True)
+def push(u, i, excess, dist, bucket_head, next_in_bucket, max_height,
+         edge_to, edge_rev, residual):
+    """Pushes flow from node u to edge_to[i] across the admissible arc i."""
+    # discharge only calls this with excess[u] > 0 and residual[i] > 0, so amt > 0
+    amt = min(excess[u], residual[i])
+
+    v = edge_to[i]
+    # Forward and reverse arc residual updates
+    residual[i] -= amt
+    residual[edge_rev[i]] += amt
+
+    # Excess update
+    excess[u] -= amt
+    excess[v] += amt
+
+    # Enqueue the receiving node if it just became active
+    if excess[v] == amt:
+        enqueue(v, dist, bucket_head, next_in_bucket, max_height)
+
+
+@njit(cache=True)
+def gap(k, dist, count, h_head, h_next, h_prev, n):
+    """Performs the gap heuristic when count[k] == 1 for some k < n."""
+    # Every node with a label in [k, n) can no longer reach the sink. Nodes
+    # above the node being discharged are inactive, so no bucket changes.
+    # Occupied labels below n are contiguous, so the walk stops at the first
+    # empty height.
+    for h in range(k, n):
+        v = h_head[h]
+        if v == -1:
+            break
+
+        while v != -1:
+            next_v = h_next[v]
+            # Relabel to n + 1 (effectively infinity)
+            dist[v] = n + 1
+            height_link(v, n + 1, h_head, h_next, h_prev)
+            count[n + 1] += 1
+            v = next_v
+
+        h_head[h] = -1
+        count[h] = 0
+
+
+@njit(cache=True)
+def relabel(u, dist, count, h_head, h_next, h_prev, row_start, row_end, edge_to, residual, n):
+    """Increases the distance label of u."""
+    count[dist[u]] -= 1
+    height_unlink(u, dist[u], h_head, h_next, h_prev)
+    new_dist = 2 * n  # Initialize to a large value
+
+    # Find the minimum possible new distance label
+    for i in range(row_start[u], row_end[u]):
+        if residual[i] > 0:
+            new_dist = min(new_dist, dist[edge_to[i]] + 1)
+
+    dist[u] = new_dist
+    count[dist[u]] += 1
+    height_link(u, new_dist, h_head, h_next, h_prev)
+
+
+@njit(cache=True)
+def discharge(u, excess, dist, count, head, row_start, row_end,
+              edge_to, residual, edge_rev,
+              bucket_head, next_in_bucket, max_height, h_head, h_next, h_prev, n):
+    """Discharges the excess flow from node u and returns the work done."""
+    work = 0
+    # Work is one unit per push plus the arcs scanned by each relabel.
+    # The row of u never changes, so its bounds are read once. The current
+    # arc and the label of u live in locals for the whole discharge; head[u]
+    # is written back on exit
+    start = row_start[u]
+    end = row_end[u]
+    i = start + head[u]
+    dist_u = dist[u]
+    while excess[u] > 0:
+        if i < end:
+            # Current arc heuristic
+            # Check for residual capacity and valid height for pushing; the
+            # non-short-circuit & leaves one data-dependent branch per arc
+            admissible = (residual[i] > 0) & (dist_u == dist[edge_to[i]] + 1)
+            if admissible:
+                push(u, i, excess, dist, bucket_head, next_in_bucket, max_height,
+                     edge_to, edge_rev, residual)
+                work += 1
+            else:
+                i += 1  # Advance current arc
+        else:
+            # No suitable arc found, need to relabel or apply gap heuristic
+
+            # Check for gap heuristic condition (only one node at this height)
+            if dist_u < n and count[dist_u] == 1:
+                gap(dist_u, dist, count, h_head, h_next, h_prev, n)
+            else:
+                relabel(u, dist, count, h_head, h_next, h_prev,
+                        row_start, row_end, edge_to, residual, n)
+                work += end - start
+
+            # After relabel/gap, pick up the new label and reset current arc
+            dist_u = dist[u]
+            i = start
+
+    head[u] = i - start
+    return work
+
+
+@njit(cache=True)
+def global_relabel(s, t, excess, dist, count, head, bucket_head, next_in_bucket, max_height,
+                   h_head, h_next, h_prev, bfs_queue,
+                   row_start, row_end, edge_to, edge_rev, residual, n):
+    """Sets every label to its exact residual distance."""
+    # Reverse BFS from the sink, then from the source (offset by n) for the
+    # nodes that can only return their excess. Nodes reached by neither keep
+    # the unreachable label 2n. Exact distances never lower a valid label.
+    # count, the height lists, the current arcs and the active buckets are
+    # rebuilt from the new labels at the end.
+    for v in range(n):
+        dist[v] = 2 * n
+    dist[t] = 0
+    bfs_queue[0] = t
+    q_head = 0
+    q_tail = 1
+    while True:
+        while q_head < q_tail:
+            x = bfs_queue[q_head]
+            q_head += 1
+            d = dist[x] + 1
+            for i in range(row_start[x], row_end[x]):
+                y = edge_to[i]
+                j = edge_rev[i]
+                # y can reach x if its arc y -> x has residual capacity
+                if dist[y] == 2 * n and y != s and residual[j] > 0:
+                    dist[y] = d
+                    bfs_queue[q_tail] = y
+                    q_tail += 1
+
+        if dist[s] != 2 * n:
+            break
+        dist[s] = n
+        bfs_queue[q_tail] = s
+        q_tail += 1
+
+    for h in range(2 * n + 1):
+        count[h] = 0
+        bucket_head[h] = -1
+        h_head[h] = -1
+    max_height[0] = -1
+    for v in range(n):
+        count[dist[v]] += 1
+        height_link(v, dist[v], h_head, h_next, h_prev)
+        # Labels changed, so every current arc starts over
+        head[v] = 0
+        if v != s and v != t and excess[v] > 0:
+            enqueue(v, dist, bucket_head, next_in_bucket, max_height)
+
+
+@njit(cache=True)
+def solve(s, t, excess, dist, count, head, bucket_head, next_in_bucket, max_height,
+          h_head, h_next, h_prev, bfs_queue,
+          row_start, row_end, edge_to, edge_rev, edge_cap, residual, n):
+    """Runs the whole push-relabel loop from source s to sink t and returns the flow value."""
+    # Start from the zero flow, so that repeated solves on one graph reuse
+    # every array in place (global_relabel below rewrites dist, count, head,
+    # the height lists and the buckets)
+    for v in range(n):
+        excess[v] = 0
+    for i in range(len(residual)):
+        residual[i] = edge_cap[i]
+
+    # Initial push from source s
+    for i in range(row_start[s], row_end[s]):
+        amt = residual[i]
+
+        if amt == 0:
+            continue
+
+        v = edge_to[i]
+        residual[i] = 0
+        residual[edge_rev[i]] += amt
+        excess[v] += amt
+
+    # Exact initial labels; this also fills count, the height lists and the active buckets
+    global_relabel(s, t, excess, dist, count, head, bucket_head, next_in_bucket, max_height,
+                   h_head, h_next, h_prev, bfs_queue,
+                   row_start, row_end, edge_to, edge_rev, residual, n)
+
+    # Global update heuristic: relabel globally again once the work since the
+    # last update exceeds ALPHA * n + BETA * m (hi_pr's frequency)
+    update_threshold = GLOBAL_UPDATE_ALPHA * n + GLOBAL_UPDATE_BETA * len(edge_to)
+    work = 0
+
+    # Main loop: discharge the active node with the highest label
+    while max_height[0] >= 0:
+        if work > update_threshold:
+            global_relabel(s, t, excess, dist, count, head, bucket_head, next_in_bucket, max_height,
+                           h_head, h_next, h_prev, bfs_queue,
+                           row_start, row_end, edge_to, edge_rev, residual, n)
+            work = 0
+            continue
+
+        h = max_height[0]
+        u = bucket_head[h]
+        if u == -1:
+            max_height[0] = h - 1
+            continue
+        bucket_head[h] = next_in_bucket[u]
+
+        if u == s or u == t:
+            continue
+
+        work += discharge(u, excess, dist, count, head, row_start, row_end,
+                          edge_to, residual, edge_rev,
+                          bucket_head, next_in_bucket, max_height, h_head, h_next, h_prev, n)
+
+    # The flow on an arc is its capacity minus its residual capacity
+    flow = 0
+    for i in range(row_start[s], row_end[s]):
+        flow += edge_cap[i] - residual[i]
+
+    return flow
+
+
+# The kernel PushRelabel runs: the Numba-compiled solve() above, else the
+# Cython build made by setup.py build_ext --inplace, else plain Python
+if HAVE_NUMBA:
+    solve_kernel = solve
+else:
+    try:
+        from _pushrelabel import solve as cython_solve
+        solve_kernel = cython_solve
+    except ImportError:
+        solve_kernel = solve
+
 
 # The PushRelabel class implements the algorithm
 class PushRelabel:
     """Implements the highest label preflow push-relabel algorithm for max-flow."""
     def __init__(self, nodes: int):
         self.n: int = nodes
-        # Adjacency list: adj[u] is a list of Edge objects from node u
-        self.adj: List[List[Edge]] = [[] for _ in range(nodes)]
+        # Edges buffered by addEdge as (u, v, cap) columns until the CSR arrays are built
+        self.edge_u: array = array('q')
+        self.edge_v: array = array('q')
+        self.edge_c: array = array('q')
+        # CSR residual graph: the arcs of u are edge_*[row_start[u]:row_end[u]]
+        self.row_start: array = array('q')
+        self.row_end: array = array('q')
+        # edge_to[i] is the node arc i goes to
+        self.edge_to: array = array('q')
+        # edge_rev[i] is the global index of the reverse arc of i
+        self.edge_rev: array = array('q')
+        # Capacity and residual capacity (cap - flow) of each arc (32-bit when all capacities fit)
+        self.edge_cap: array = array('q')
+        self.residual: array = array('q')
+        self.built: bool = False
         # Preflow excess for each node
-        self.excess: List[int] = [0] * nodes
+        self.excess: array = array('q', [0]) * nodes
         # Distance (height) label for each node
-        self.dist: List[int] = [0] * nodes
+        self.dist: array = array('q', [0]) * nodes
         # count[i] stores the number of nodes v such that dist[v] == i (for gap heuristic)
-        self.count: List[int] = [0] * (2 * nodes + 1)
-        # active[v] is true if v has excess flow and is not the source/sink
-        self.active: List[bool] = [False] * nodes
-        # head[u] is the index of the 'current arc' (for arc-choosing heuristic)
-        self.head: List[int] = [0] * nodes
-        # Queue for active nodes
-        self.Q: deque[int] = deque()
-
-    def enqueue(self, v: int):
-        """Adds a node to the active queue if it has positive excess and isn't already active."""
-        if not self.active[v] and self.excess[v] > 0:
-            self.active[v] = True
-            self.Q.append(v)
-
-    def push(self, u: int, e: Edge):
-        """Pushes flow from node u to e.to across edge e."""
-        amt: int = min(self.excess[u], e.cap - e.flow)
-        
-        if amt == 0:
-            return
+        self.count: array = array('i', [0]) * (2 * nodes + 1)
+        # head[u] is the offset of the 'current arc' within row u (for arc-choosing heuristic)
+        self.head: array = array('q', [0]) * nodes
+        # Active nodes bucketed by height (see enqueue) and the highest non-empty bucket
+        self.bucket_head: array = array('q', [-1]) * (2 * nodes + 1)
+        self.next_in_bucket: array = array('q', [-1]) * nodes
+        self.max_height: array = array('q', [-1])
+        # All nodes listed by height (see height_link), used by the gap heuristic
+        self.h_head: array = array('q', [-1]) * (2 * nodes + 1)
+        self.h_next: array = array('q', [-1]) * nodes
+        self.h_prev: array = array('q', [-1]) * nodes
+        # Scratch queue for the global relabeling BFS
+        self.bfs_queue: array = array('q', [0]) * nodes
+
+    def addEdge(self, u: int, v: int, cap: int):
+        """Records a forward edge; it and its residual edge are laid out by build()."""
+        self.edge_u.append(u)
+        self.edge_v.append(v)
+        self.edge_c.append(cap)
+        self.built = False
 
-        # Forward edge flow update
-        e.flow += amt
-        # Reverse edge flow update (index is e.rev, which is stored in the edge)
-        self.adj[e.to][e.rev].flow -= amt
-        
-        # Excess update
-        self.excess[u] -= amt
-        self.excess[e.to] += amt
-        
-        # Enqueue the receiving node if it gains excess
-        self.enqueue(e.to)
-
-    def gap(self, k: int):
-        """Performs the gap heuristic when count[k] == 1."""
-        for v in range(self.n):
-            if self.dist[v] < k:
+    def addEdges(self, us: array, vs: array, caps: array):
+        """Records a batch of forward edges given as parallel columns."""
+        self.edge_u.extend(us)
+        self.edge_v.extend(vs)
+        self.edge_c.extend(caps)
+        self.built = False
+
+    def build(self):
+        """Lays out the recorded edges and their residual edges as CSR arrays."""
+        n: int = self.n
+
+        # Self-loops never carry flow, and neither arc of an edge without
+        # capacity ever has residual capacity (the two residuals always sum
+        # to the capacity), so both are dropped rather than rescanned by
+        # every discharge and relabel. Parallel edges u -> v act as a single
+        # edge with their summed capacity and are merged into one.
+        edge_u: array = array('q')
+        edge_v: array = array('q')
+        edge_c: array = array('q')
+        edge_index: dict = {}
+        for u, v, c in zip(self.edge_u, self.edge_v, self.edge_c):
+            if u == v or c <= 0:
                 continue
-            
-            self.count[self.dist[v]] -= 1
-            # Relabel to n + 1 (effectively infinity)
-            self.dist[v] = max(self.dist[v], self.n + 1)
-            self.count[self.dist[v]] += 1
-            self.enqueue(v)
-
-    def relabel(self, u: int):
-        """Increases the distance label of u."""
-        self.count[self.dist[u]] -= 1
-        new_dist: int = 2 * self.n  # Initialize to a large value
-        
-        # Find the minimum possible new distance label
-        for edge in self.adj[u]:
-            if edge.cap - edge.flow > 0:
-                new_dist = min(new_dist, self.dist[edge.to] + 1)
-        
-        self.dist[u] = new_dist
-        self.count[self.dist[u]] += 1
-        self.enqueue(u)
-
-    def discharge(self, u: int, s: int, t: int):
-        """Discharges the excess flow from node u."""
-        while self.excess[u] > 0:
-            if self.head[u] < len(self.adj[u]):
-                # Current arc heuristic
-                edge: Edge = self.adj[u][self.head[u]]
-                
-                # Check for residual capacity and valid height for pushing
-                if edge.cap - edge.flow > 0 and self.dist[u] == self.dist[edge.to] + 1:
-                    self.push(u, edge)
-                else:
-                    self.head[u] += 1  # Advance current arc
+            k = edge_index.get(u * n + v)
+            if k is None:
+                edge_index[u * n + v] = len(edge_c)
+                edge_u.append(u)
+                edge_v.append(v)
+                edge_c.append(c)
             else:
-                # No suitable arc found, need to relabel or apply gap heuristic
-                
-                # Check for gap heuristic condition (only one node at this height)
-                if self.dist[u] < len(self.count) and self.count[self.dist[u]] == 1:
-                    self.gap(self.dist[u])
-                else:
-                    self.relabel(u)
-                    
-                # After relabel/gap, reset current arc
-                self.head[u] = 0
+                edge_c[k] += c
+        del edge_index
+        m: int = len(edge_c)
 
-    def addEdge(self, u: int, v: int, cap: int):
-        """Adds a forward edge and its reverse (residual) edge."""
-        if u == v:
-            return
-        
-        # Forward edge: u -> v
-        # rev_index will be the index of the reverse edge in adj[v]
-        forward_rev_index: int = len(self.adj[v])
-        # Reverse edge: v -> u (capacity 0 for initial graph)
-        reverse_rev_index: int = len(self.adj[u])
-        
-        self.adj[u].append(Edge(v, forward_rev_index, 0, cap))
-        self.adj[v].append(Edge(u, reverse_rev_index, 0, 0)) # Residual edge
+        # Each edge occupies a slot in the row of both of its endpoints
+        degree: array = array('q', [0]) * n
+        for k in range(m):
+            degree[edge_u[k]] += 1
+            degree[edge_v[k]] += 1
+
+        # Prefix sum of the degrees gives the first slot of every row
+        row_start: array = array('q', [0]) * n
+        total: int = 0
+        for u in range(n):
+            row_start[u] = total
+            total += degree[u]
+
+        edge_to: array = array('q', [0]) * total
+        edge_rev: array = array('q', [0]) * total
+        # Both arcs of an edge keep a residual capacity between 0 and the edge's
+        # capacity, so 32-bit columns suffice unless some capacity does not fit
+        # (excess stays 64-bit, it sums many arcs)
+        cap_type: str = 'q'
+        if m and max(edge_c) < 2**31:
+            cap_type = 'i'
+        edge_cap: array = array(cap_type, [0]) * total
+        # row_end doubles as the fill cursor of each row
+        row_end: array = array('q', row_start)
+        for k in range(m):
+            u, v = edge_u[k], edge_v[k]
+            i: int = row_end[u]
+            row_end[u] += 1
+            j: int = row_end[v]
+            row_end[v] += 1
+
+            # Forward edge u -> v and residual edge v -> u (capacity 0), cross-linked
+            edge_to[i] = v
+            edge_rev[i] = j
+            edge_cap[i] = edge_c[k]
+            edge_to[j] = u
+            edge_rev[j] = i
+
+        self.row_start = row_start
+        self.row_end = row_end
+        self.edge_to = edge_to
+        self.edge_rev = edge_rev
+        self.edge_cap = edge_cap
+        self.residual = array(cap_type, edge_cap)
+        self.built = True
 
     def getMaxFlow(self, s: int, t: int) -> int:
         """Calculates the maximum flow from source s to sink t."""
+        # solve() resets its state in place, so repeated queries reuse the arrays
         if s < 0 or t < 0 or s >= self.n or t >= self.n:
             return 0
-        
-        # Initialization
-        self.dist[s] = self.n
-        self.count[0] = self.n - 1 
-        self.count[self.n] = 1     
-        
-        # Initial push from source s
-        for edge in self.adj[s]:
-            self.excess[s] += edge.cap
-            amt = edge.cap
-            
-            if amt == 0:
-                continue
 
-            edge.flow += amt
-            self.adj[edge.to][edge.rev].flow -= amt
-            self.excess[s] -= amt
-            self.excess[edge.to] += amt
-            self.enqueue(edge.to)
-            
-        # Main loop: process active nodes
-        while self.Q:
-            u: int = self.Q.popleft()
-            self.active[u] = False 
-            
-            if u == s or u == t:
-                continue
-            
-            self.discharge(u, s, t)
-            
-        flow: int = 0
-        for edge in self.adj[s]:
-            flow += edge.flow
-            
-        return flow
+        if not self.built:
+            self.build()
+
+        return solve_kernel(s, t, self.excess, self.dist, self.count, self.head,
+                            self.bucket_head, self.next_in_bucket, self.max_height,
+                            self.h_head, self.h_next, self.h_prev, self.bfs_queue,
+                            self.row_start, self.row_end, self.edge_to, self.edge_rev,
+                            self.edge_cap, self.residual, self.n)
 
 
 def main():
@@ -179,17 +463,24 @@ def main():
     if len(sys.argv) > 1:
         try:
             # Open the file provided in the first argument
-            input_source = open(sys.argv[1], 'r')
+            input_source = open(sys.argv[1], 'rb')
         except FileNotFoundError:
             sys.stderr.write(f"Error: File '{sys.argv[1]}' not found.\n")
             sys.exit(1)
     else:
         # Default to standard input
-        input_source = sys.stdin
+        input_source = sys.stdin.buffer
 
-    # Read from the determined source
+    # Read the whole input at once; 'a' lines are only collected here and
+    # parsed in bulk below, everything else is handled line by line
+    arc_lines = []
     with input_source:
-        for line in input_source:
+        for line in input_source.read().split(b'\n'):
+            if line[:1] == b'a':
+                if solver:
+                    arc_lines.append(line)
+                continue
+
             line = line.strip()
             if not line:
                 continue
@@ -200,38 +491,54 @@ def main():
                 
             type_char = parts[0]
             
-            if type_char == 'c':
+            if type_char == b'c':
                 continue
-            elif type_char == 'p':
+            elif type_char == b'p':
                 if len(parts) >= 3:
                     try:
                         num_nodes = int(parts[2])
                         solver = PushRelabel(num_nodes)
+                        # A new problem line starts over; earlier arcs belonged to the old one
+                        arc_lines = []
                     except ValueError:
                         sys.stderr.write("Error parsing 'p' line.\n")
                         return
-            elif type_char == 'n':
+            elif type_char == b'n':
                 if len(parts) >= 3 and solver:
                     try:
                         node_id = int(parts[1])
                         node_type = parts[2]
-                        if node_type == 's':
+                        if node_type == b's':
                             s = node_id - 1
-                        elif node_type == 't':
+                        elif node_type == b't':
                             t = node_id - 1
                     except ValueError:
                         sys.stderr.write("Error parsing 'n' line.\n")
                         return
-            elif type_char == 'a':
-                if len(parts) >= 4 and solver:
-                    try:
-                        u = int(parts[1])
-                        v = int(parts[2])
-                        cap = int(parts[3])
-                        solver.addEdge(u - 1, v - 1, cap)
-                    except ValueError:
-                        sys.stderr.write("Error parsing 'a' line.\n")
-                        return
+            elif type_char == b'a':
+                if solver:
+                    arc_lines.append(line)
+
+    # Tokenize all 'a' lines in one pass when every line is exactly 'a u v cap'
+    if solver and arc_lines:
+        tokens = b' '.join(arc_lines).split()
+        if len(tokens) != 4 * len(arc_lines) or tokens[0::4].count(b'a') != len(arc_lines):
+            # Otherwise split line by line like a per-line parser would: take
+            # u, v and cap from 'a' lines with at least 4 fields, ignore extra
+            # fields, and skip short lines and other words starting with 'a'
+            tokens = []
+            for line in arc_lines:
+                parts = line.split()
+                if len(parts) >= 4 and parts[0] == b'a':
+                    tokens.extend(parts[:4])
+        try:
+            us = array('q', [int(x) - 1 for x in tokens[1::4]])
+            vs = array('q', [int(x) - 1 for x in tokens[2::4]])
+            caps = array('q', [int(x) for x in tokens[3::4]])
+        except ValueError:
+            sys.stderr.write("Error parsing 'a' line.\n")
+            return
+        solver.addEdges(us, vs, caps)
 
     # Calculate and output the max flow
     if solver and s != -1 and t != -1:
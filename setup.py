@@ -0,0 +1,8 @@
+"""Builds the optional Cython kernels: python setup.py build_ext --inplace"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="push-relabel-kernels",
+    ext_modules=cythonize("_pushrelabel.pyx", compiler_directives={"language_level": 3}),
+)